@@ -0,0 +1,151 @@
+import io
+import streamlit as st
+
+# === Fixed Light Theme ===
+background_color = "#87CEEB"
+text_color = "#000000"
+
+# === Page Header ===
+_HEADER_CSS_TEMPLATE = """
+    <style>
+        .title-style {{
+            text-align: center;
+            color: #00008B;
+            font-size: 42px;
+            font-weight: bold;
+            margin-bottom: 10px;
+        }}
+        .subtitle-style {{
+            text-align: center;
+            color: #444444;
+            font-size: 18px;
+            font-weight: bold;
+            margin-bottom: 30px;
+        }}
+        .stApp {{
+            background-color: {bg};
+            color: {fg};
+        }}
+    </style>
+    <div class="title-style">🧮 Dynamic Machine Hour Rate (DMHR) Calculator</div>
+    <div class="subtitle-style">Created by: Adedeji, Favour Busayo</div>
+    <hr style='margin-top: 0'>
+"""
+
+# Formatted once when the module is first imported, not on every rerun
+HEADER_HTML = _HEADER_CSS_TEMPLATE.format(bg=background_color, fg=text_color)
+
+# === Calculation Functions ===
+def calculate_fixed_costs(Pm, Ls, inflation_rate, insurance_rate, am, Af, Cb, Hf, Oc, tax_env_cost):
+    amortized_cost = Pm / Ls
+    inflation_adjustment = Pm * inflation_rate
+    insurance_cost = Pm * insurance_rate
+    # Af defaults to 0 in the form; treat "no factory area" as no space cost
+    building_space_cost = (am / Af) * Cb if Af else 0.0
+    overhead_cost = (Hf / Ls) * Oc
+    return amortized_cost + inflation_adjustment + insurance_cost + building_space_cost + overhead_cost + tax_env_cost
+
+def calculate_variable_costs(Pt_m, Rt, Sm, Um, labour_rate, Hf):
+    energy_cost = Pt_m * Rt
+    maintenance_cost = Sm + Um
+    labour_cost = labour_rate * Hf
+    return energy_cost + maintenance_cost + labour_cost
+
+def calculate_dmhr(FC, VC, Hf):
+    return (FC + VC) / Hf
+
+# === Chart Builders ===
+# Fixed Vega-Lite spec for the two-bar cost chart; only the data changes per run
+COST_BAR_SPEC = {
+    "mark": "bar",
+    "encoding": {
+        "x": {"field": "Cost Type", "type": "nominal"},
+        "y": {"field": "Amount", "type": "quantitative"}
+    }
+}
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_cost_pie(FC, VC):
+    import plotly.express as px
+
+    return px.pie(
+        values=[FC, VC],
+        names=['Fixed Costs', 'Variable Costs'],
+        labels={'values': 'Amount', 'names': 'Cost Type'},
+        title='Fixed vs Variable Cost Share'
+    )
+
+# === Excel Export with Charts ===
+_PARAM_LABELS = {
+    "Pm": "Machine Purchase Cost (₦)",
+    "Ls": "Machine Life Span (hours)",
+    "inflation_rate": "Inflation Rate",
+    "insurance_rate": "Insurance Rate",
+    "am": "Area Occupied by Machine (m²)",
+    "Af": "Total Factory Area (m²)",
+    "Cb": "Building Cost or Rent (₦)",
+    "Hf": "Machine Hours Used (hours)",
+    "Oc": "Overhead Cost (₦)",
+    "tax_env_cost": "Tax & Environmental Cost (₦)",
+    "Pt_m": "Energy Use (kWh)",
+    "Rt": "Energy Cost per kWh (₦)",
+    "Sm": "Scheduled Maintenance (₦)",
+    "Um": "Unscheduled Maintenance (₦)",
+    "labour_rate": "Labour Cost per Hour (₦)"
+}
+
+def write_sheet_rows(workbook, sheet_name, header, rows, header_format=None, row_format=None):
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, header, header_format)
+    for row_idx, row in enumerate(rows, start=1):
+        worksheet.write_row(row_idx, 0, row, row_format)
+    return worksheet
+
+# Cached on the inputs and results, so reruns that reach the download button
+# with unchanged values reuse the workbook bytes instead of rebuilding them;
+# each entry is a whole xlsx, so keep the cache small
+@st.cache_data(show_spinner=False, max_entries=32)
+def export_to_excel_with_charts(inputs_dict, results_dict):
+    import xlsxwriter
+
+    input_rows = [(_PARAM_LABELS.get(k, k), v) for k, v in inputs_dict.items()]
+    result_header = list(results_dict)
+
+    # The workbook is tiny, so assemble it entirely in memory; constant_memory
+    # would stream every sheet through a tempfile even with a BytesIO target
+    buffer = io.BytesIO()
+    with xlsxwriter.Workbook(buffer, {'in_memory': True}) as workbook:
+        header_format = workbook.add_format({'bold': True, 'border': 1})
+        # Keep full precision in the cells and let Excel display two decimals
+        money_format = workbook.add_format({'num_format': '#,##0.00'})
+        write_sheet_rows(workbook, "Inputs", ["Parameter", "Value"], input_rows, header_format)
+        worksheet = write_sheet_rows(workbook, "Results", result_header,
+                                     [list(results_dict.values())], header_format, money_format)
+        worksheet.set_column(1, len(result_header) - 1, 14)
+
+        chart1 = workbook.add_chart({'type': 'column'})
+        chart1.add_series({
+            'name': 'Fixed Cost',
+            'categories': ['Results', 1, 0, 1, 0],
+            'values': ['Results', 1, 1, 1, 1],
+            'fill': {'color': '#1f77b4'}
+        })
+        chart1.add_series({
+            'name': 'Variable Cost',
+            'categories': ['Results', 1, 0, 1, 0],
+            'values': ['Results', 1, 2, 1, 2],
+            'fill': {'color': '#ff7f0e'}
+        })
+        chart1.set_title({'name': 'Fixed vs Variable Costs'})
+        worksheet.insert_chart('E2', chart1)
+
+        chart2 = workbook.add_chart({'type': 'pie'})
+        chart2.add_series({
+            'name': 'Cost Distribution',
+            'categories': ['Results', 0, 1, 0, 2],
+            'values': ['Results', 1, 1, 1, 2],
+        })
+        chart2.set_title({'name': 'Cost Share'})
+        worksheet.insert_chart('E20', chart2)
+
+    return buffer.getvalue()
@@ -1,120 +1,86 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
-from datetime import datetime
-
-# === Fixed Light Theme ===
-background_color = "#87CEEB"
-text_color = "#000000"
-
-st.markdown(f"""
-    <style>
-        .title-style {{
-            text-align: center;
-            color: #00008B;
-            font-size: 42px;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }}
-        .subtitle-style {{
-            text-align: center;
-            color: #444444;
-            font-size: 18px;
-            font-weight: bold;
-            margin-bottom: 30px;
-        }}
-        .stApp {{
-            background-color: {background_color};
-            color: {text_color};
-        }}
-    </style>
-    <div class="title-style">🧮 Dynamic Machine Hour Rate (DMHR) Calculator</div>
-    <div class="subtitle-style">Created by: Adedeji, Favour Busayo</div>
-    <hr style='margin-top: 0'>
-""", unsafe_allow_html=True)
-
-# === Calculation Functions ===
-def calculate_fixed_costs(Pm, Ls, inflation_rate, insurance_rate, am, Af, Cb, Hf, Oc, tax_env_cost):
-    amortized_cost = Pm / Ls
-    inflation_adjustment = Pm * inflation_rate
-    insurance_cost = Pm * insurance_rate
-    building_space_cost = (am / Af) * Cb
-    overhead_cost = (Hf / Ls) * Oc
-    return amortized_cost + inflation_adjustment + insurance_cost + building_space_cost + overhead_cost + tax_env_cost
-
-def calculate_variable_costs(Pt_m, Rt, Sm, Um, labour_rate, Hf):
-    energy_cost = Pt_m * Rt
-    maintenance_cost = Sm + Um
-    labour_cost = labour_rate * Hf
-    return energy_cost + maintenance_cost + labour_cost
-
-def calculate_dmhr(FC, VC, Hf):
-    return (FC + VC) / Hf
-
-# === Excel Export with Charts ===
-def export_to_excel_with_charts(inputs_dict, results_df, project_name="DMHR_Project"):
-    import xlsxwriter
-
-    param_labels = {
-        "Pm": "Machine Purchase Cost (₦)",
-        "Ls": "Machine Life Span (hours)",
-        "inflation_rate": "Inflation Rate",
-        "insurance_rate": "Insurance Rate",
-        "am": "Area Occupied by Machine (m²)",
-        "Af": "Total Factory Area (m²)",
-        "Cb": "Building Cost or Rent (₦)",
-        "Hf": "Machine Hours Used (hours)",
-        "Oc": "Overhead Cost (₦)",
-        "tax_env_cost": "Tax & Environmental Cost (₦)",
-        "Pt_m": "Energy Use (kWh)",
-        "Rt": "Energy Cost per kWh (₦)",
-        "Sm": "Scheduled Maintenance (₦)",
-        "Um": "Unscheduled Maintenance (₦)",
-        "labour_rate": "Labour Cost per Hour (₦)"
+import time
+
+# Shared calculation and export code lives in a module so it is built once
+# per process rather than on every Streamlit rerun of this script
+from dmhr_core import (
+    HEADER_HTML,
+    calculate_fixed_costs,
+    calculate_variable_costs,
+    calculate_dmhr,
+    build_cost_pie,
+    COST_BAR_SPEC,
+    export_to_excel_with_charts,
+)
+
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+# === Results View ===
+# Runs as a fragment so any interactive widget added here later reruns only
+# this block; today nothing in it triggers a rerun, since the download button
+# uses on_click="ignore"
+@st.fragment
+def show_results(FC, VC, DMHR, Hf, inputs_dict, project_name):
+    # Plotly is only needed once there are results to chart, so skip its
+    # import cost on the initial page load
+    import plotly.express as px
+
+    summary_df = pd.DataFrame([{
+        "💰 Fixed Costs (₦)": FC,
+        "🛠️ Variable Costs (₦)": VC,
+        "📊 DMHR (₦/hr)": DMHR
+    }])
+    st.dataframe(summary_df.style.format("{:,.2f}"), hide_index=True, width="stretch")
+
+    # Bar Chart
+    st.subheader("📊 Cost Breakdown (Bar Chart)")
+    st.vega_lite_chart({
+        **COST_BAR_SPEC,
+        "data": {"values": [
+            {"Cost Type": "Fixed Costs", "Amount": FC},
+            {"Cost Type": "Variable Costs", "Amount": VC}
+        ]}
+    }, width="stretch")
+
+    # Pie Chart
+    st.subheader("🥧 Cost Breakdown (Pie Chart)")
+    st.plotly_chart(build_cost_pie(FC, VC), width="stretch", key="cost_pie")
+
+    # Single Machine Line Chart (Deep Red)
+    hours = np.linspace(1, Hf, int(Hf))
+    cumulative_cost = (FC + VC) * (hours / Hf)
+
+    fig_line_single = px.line(
+        x=hours,
+        y=cumulative_cost,
+        labels={"x": "Hours Used", "y": "Cumulative Cost (₦)"},
+        title="Cumulative Cost Over Machine Usage Time",
+        markers=True
+    )
+    fig_line_single.update_traces(line=dict(color="#d62728", width=3))
+    st.plotly_chart(fig_line_single, width="stretch")
+
+    # Prepare data for Excel export
+    results_dict = {
+        "Machine": project_name,
+        "Fixed Cost": FC,
+        "Variable Cost": VC,
+        "DMHR (₦/hr)": DMHR
     }
 
-    inputs_df = pd.DataFrame([
-        {"Parameter": param_labels.get(k, k), "Value": v}
-        for k, v in inputs_dict.items()
-    ])
-
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"{project_name.replace(' ', '_')}_{timestamp}.xlsx"
-
-    with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
-        inputs_df.to_excel(writer, sheet_name="Inputs", index=False)
-        results_df.to_excel(writer, sheet_name="Results", index=False)
-
-        workbook = writer.book
-        worksheet = writer.sheets["Results"]
-
-        chart1 = workbook.add_chart({'type': 'column'})
-        chart1.add_series({
-            'name': 'Fixed Cost',
-            'categories': ['Results', 1, 0, len(results_df), 0],
-            'values': ['Results', 1, 1, len(results_df), 1],
-            'fill': {'color': '#1f77b4'}
-        })
-        chart1.add_series({
-            'name': 'Variable Cost',
-            'categories': ['Results', 1, 0, len(results_df), 0],
-            'values': ['Results', 1, 2, len(results_df), 2],
-            'fill': {'color': '#ff7f0e'}
-        })
-        chart1.set_title({'name': 'Fixed vs Variable Costs'})
-        worksheet.insert_chart('E2', chart1)
-
-        chart2 = workbook.add_chart({'type': 'pie'})
-        chart2.add_series({
-            'name': 'Cost Distribution',
-            'categories': ['Results', 0, 1, 0, 2],
-            'values': ['Results', 1, 1, 1, 2],
-        })
-        chart2.set_title({'name': 'Cost Share'})
-        worksheet.insert_chart('E20', chart2)
-
-    return filename
+    # Building the workbook is the slowest step, so pass it as a callable and
+    # let Streamlit run it only when the download is actually clicked
+    timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+    excel_file = f"{project_name.replace(' ', '_')}_{timestamp}.xlsx"
+    st.download_button(
+        "📥 Download Full Excel Report",
+        data=lambda: export_to_excel_with_charts(inputs_dict, results_dict),
+        file_name=excel_file,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        on_click="ignore"
+    )
 
 # === App Logic ===
 with st.form(key="single_machine_form"):
@@ -147,55 +113,9 @@ if submitted:
 
     st.success("✅ Calculation Complete!")
 
-    col1, col2, col3 = st.columns(3)
-    col1.metric("💰 Fixed Costs (₦)", f"{FC:,.2f}")
-    col2.metric("🛠️ Variable Costs (₦)", f"{VC:,.2f}")
-    col3.metric("📊 DMHR (₦/hr)", f"{DMHR:,.2f}")
-
-    # Bar Chart
-    cost_data = pd.DataFrame({
-        "Cost Type": ["Fixed Costs", "Variable Costs"],
-        "Amount": [FC, VC]
-    })
-    st.subheader("📊 Cost Breakdown (Bar Chart)")
-    st.bar_chart(cost_data.set_index("Cost Type"))
-
-    # Pie Chart
-    pie_data = pd.DataFrame({
-        'Cost Type': ['Fixed Costs', 'Variable Costs'],
-        'Amount': [FC, VC]
-    })
-    st.subheader("🥧 Cost Breakdown (Pie Chart)")
-    st.plotly_chart(px.pie(pie_data, values='Amount', names='Cost Type', title='Fixed vs Variable Cost Share'), use_container_width=True)
-
-    # Single Machine Line Chart (Deep Red)
-    hours = np.linspace(1, Hf, int(Hf))
-    cumulative_cost = (FC + VC) * (hours / Hf)
-    df_line = pd.DataFrame({"Hours Used": hours, "Cumulative Cost (₦)": cumulative_cost})
-
-    fig_line_single = px.line(
-        df_line,
-        x="Hours Used",
-        y="Cumulative Cost (₦)",
-        title="Cumulative Cost Over Machine Usage Time",
-        markers=True
-    )
-    fig_line_single.update_traces(line=dict(color="#d62728", width=3))
-    st.plotly_chart(fig_line_single, use_container_width=True)
-
-    # Prepare data for Excel export
     inputs_dict = {
         "Pm": Pm, "Ls": Ls, "inflation_rate": inflation_rate, "insurance_rate": insurance_rate,
         "am": am, "Af": Af, "Cb": Cb, "Hf": Hf, "Oc": Oc, "tax_env_cost": tax_env_cost,
         "Pt_m": Pt_m, "Rt": Rt, "Sm": Sm, "Um": Um, "labour_rate": labour_rate
     }
-    results_df = pd.DataFrame({
-        "Machine": [project_name],
-        "Fixed Cost": [round(FC, 2)],
-        "Variable Cost": [round(VC, 2)],
-        "DMHR (₦/hr)": [round(DMHR, 2)]
-    })
-
-    excel_file = export_to_excel_with_charts(inputs_dict, results_df, project_name)
-    with open(excel_file, "rb") as file:
-        st.download_button("📥 Download Full Excel Report", file, file_name=excel_file)
+    show_results(FC, VC, DMHR, Hf, inputs_dict, project_name)